@@ -1,12 +1,12 @@
 """Configuration settings for keyword intelligence."""
 
-import os
 from pathlib import Path
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent
 DATA_DIR = PROJECT_ROOT / "data"
 OUTPUT_DIR = PROJECT_ROOT / "output"
+CACHE_DIR = DATA_DIR / "cache"  # HTTP response cache
 
 # Database
 DATABASE_PATH = DATA_DIR / "keywords.db"
@@ -31,9 +31,11 @@ ARXIV_CATEGORIES = [
 MIN_TERM_LENGTH = 3
 MAX_TERM_LENGTH = 50
 MIN_TERM_FREQUENCY = 2  # Minimum times a term must appear to be stored
+SPACY_BATCH_SIZE = 64   # Texts per batch when streaming through spaCy
+MAX_TEXT_CHARS = 100_000  # Longer texts are cut (at a sentence end) before extraction
 
 # Terms to ignore (common words that aren't useful signals)
-STOP_TERMS = {
+STOP_TERMS = frozenset({
     # Generic tech words (too common)
     "software", "hardware", "computer", "system", "systems", "application",
     "applications", "technology", "technologies", "platform", "platforms",
@@ -79,8 +81,10 @@ STOP_TERMS = {
     "with", "from", "they", "their", "them", "there", "here",
     "just", "only", "also", "even", "about", "into", "over",
     "such", "than", "very", "well", "back", "down", "away",
-}
+})
 
-# Ensure directories exist
-DATA_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
+
+def ensure_dirs():
+    """Create the data and output directories if they don't exist yet."""
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
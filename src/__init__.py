@@ -1 +1,10 @@
 """Keyword Intelligence - Early signal trend tracking."""
+
+from pathlib import Path
+import sys
+
+# The project root holds config.py; put it on the path once, here, so every
+# module can import config however the package is run
+_PROJECT_ROOT = str(Path(__file__).parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
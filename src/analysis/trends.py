@@ -1,45 +1,46 @@
 """Trend analysis and velocity calculations."""
 
 from datetime import date, timedelta
-from typing import Dict, List
-from pathlib import Path
-import sys
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+if TYPE_CHECKING:
+    import numpy as np
 
-from src.database import get_all_terms_for_period, get_term_history
+from src.database import (
+    get_term_history, get_term_summary, get_source_only_terms, get_term_aggregates_for_period,
+)
 
 
-def calculate_velocity(term: str, days: int = 14) -> Dict:
+def calculate_velocity(term: str, days: int = 14, summary: Optional[Dict] = None) -> Dict:
     """
     Calculate the velocity (rate of change) for a term.
     
     Compares the term's frequency in the recent half vs older half
     of the time period.
     
+    Args:
+        term: Term to analyze
+        days: Length of the period
+        summary: Row from get_term_summary with `days` as its
+            velocity_days; queried when omitted
+    
     Returns:
         Dict with velocity metrics
     """
-    history = get_term_history(term, days=days)
-    
-    if not history:
-        return {"term": term, "velocity": 0, "trend": "no_data"}
+    if summary is None:
+        summary = get_term_summary(term, days=days, velocity_days=days)
     
-    # Split into recent and older periods
-    midpoint = date.today() - timedelta(days=days // 2)
+    # Counts for the recent and older halves are split in SQL
+    recent_count = summary["recent_count"]
+    older_count = summary["older_count"]
     
-    recent_count = sum(r["count"] for r in history if r["date"] >= str(midpoint))
-    older_count = sum(r["count"] for r in history if r["date"] < str(midpoint))
+    if not recent_count and not older_count:
+        return {"term": term, "velocity": 0, "trend": "no_data"}
     
     # Calculate velocity
     if older_count == 0:
-        if recent_count > 0:
-            velocity = float('inf')  # New term
-            trend = "new"
-        else:
-            velocity = 0
-            trend = "no_data"
+        velocity = float('inf')  # New term
+        trend = "new"
     else:
         velocity = (recent_count - older_count) / older_count
         if velocity > 0.5:
@@ -64,65 +65,43 @@ def find_emerging_terms(days: int = 7, min_count: int = 2) -> List[Dict]:
     
     These are potentially the most valuable early signals.
     """
-    all_data = get_all_terms_for_period(days=days)
-    
-    if not all_data:
-        return []
-    
-    # Group by term
-    term_data = {}
-    for record in all_data:
-        term = record["term"]
-        if term not in term_data:
-            term_data[term] = {
-                "term": term,
-                "first_seen": record["first_seen"],
-                "total_count": 0,
-                "sources": set()
-            }
-        term_data[term]["total_count"] += record["count"]
-        term_data[term]["sources"].add(record["source"])
-    
-    # Filter to recent first appearances
-    cutoff = date.today() - timedelta(days=days)
-    
-    emerging = []
-    for term, data in term_data.items():
-        first_seen = data["first_seen"]
-        if isinstance(first_seen, str):
-            first_seen = date.fromisoformat(first_seen)
-        
-        if first_seen >= cutoff and data["total_count"] >= min_count:
-            emerging.append({
-                "term": term,
-                "first_seen": str(data["first_seen"]),
-                "count": data["total_count"],
-                "source_count": len(data["sources"]),
-                "sources": list(data["sources"])
-            })
-    
-    # Sort by count (higher = more signal)
-    emerging.sort(key=lambda x: x["count"], reverse=True)
-    
-    return emerging
+    # Terms are grouped in SQL; only recent first appearances are kept
+    # (first_seen is an ISO date string, so the cutoff is compared as one)
+    cutoff = str(date.today() - timedelta(days=days))
+    
+    # Rows arrive sorted by count (higher = more signal)
+    return [
+        {
+            "term": row["term"],
+            "first_seen": row["first_seen"],
+            "count": row["total_count"],
+            "source_count": row["source_count"],
+            "sources": row["sources"],
+        }
+        for row in get_term_aggregates_for_period(days=days, min_count=min_count)
+        if row["first_seen"] >= cutoff
+    ]
 
 
 def analyze_term(term: str) -> Dict:
     """Get comprehensive analysis for a single term."""
-    velocity_data = calculate_velocity(term)
+    # The history is returned as is; totals, sources and the velocity
+    # split all come from one aggregate query
     history = get_term_history(term, days=30)
+    summary = get_term_summary(term, days=30)
+    velocity_data = calculate_velocity(term, summary=summary)
     
     return {
         "term": term,
         "velocity": velocity_data,
         "history": history,
-        "total_mentions": sum(r["count"] for r in history),
-        "sources": list(set(r["source"] for r in history))
+        "total_mentions": summary["total_count"],
+        "sources": summary["sources"]
     }
 
 
 # Terms that are too obvious/established to be "emerging"
-ESTABLISHED_TERMS = {
+ESTABLISHED_TERMS: frozenset = frozenset({
     # Well-known AI/ML terms (already mainstream)
     "model", "models", "machine", "learning", "neural", "network", "networks",
     "deep", "training", "inference", "algorithm", "algorithms", "prediction",
@@ -169,7 +148,33 @@ ESTABLISHED_TERMS = {
     "settings", "guidance", "directly", "across", "clearly", "typically",
     "overall", "therefore", "however", "although", "meanwhile", "hence",
     "state-of", "the-art", "state-of-the-art",
-}
+})
+
+
+def emergence_scores(
+    total: "np.ndarray", arxiv: "np.ndarray", source_count: "np.ndarray", is_new: "np.ndarray"
+) -> "np.ndarray":
+    """
+    Score terms for emergence from their per-term totals.
+    
+    Branchless: every rule is a boolean mask scaled by its weight, so the
+    whole batch is scored in a few vectorized passes.
+    """
+    # Big bonus for truly new terms (first seen within period)
+    score = 50 * is_new.astype("int64")
+    
+    # Bonus for arXiv presence (academic = early signal), with an extra
+    # bonus if arXiv-heavy, i.e. over half the mentions (very early)
+    score += 20 * (arxiv > 0) + 15 * (arxiv * 2 > total)
+    
+    # Bonus for cross-source validation
+    score += 10 * source_count * (source_count >= 2)
+    
+    # Bonus for count (but diminishing - we don't want already-popular)
+    # Sweet spot is moderate count, not too high
+    score += 10 * ((total >= 5) & (total <= 30)) - 10 * (total > 50)
+    
+    return score
 
 
 def get_emerging_terms(days: int = 7, min_count: int = 2, limit: int = 30) -> List[Dict]:
@@ -186,96 +191,7 @@ def get_emerging_terms(days: int = 7, min_count: int = 2, limit: int = 30) -> Li
     - Terms appearing in academic sources (arXiv) = earlier signal
     - Terms in multiple sources = validation
     """
-    all_data = get_all_terms_for_period(days=days)
-    
-    if not all_data:
-        return []
-    
-    # Group by term
-    term_stats = {}
-    for record in all_data:
-        term = record["term"]
-        
-        # Skip established terms
-        if term.lower() in ESTABLISHED_TERMS:
-            continue
-        
-        # Skip very short terms (likely noise)
-        if len(term) < 4:
-            continue
-            
-        if term not in term_stats:
-            term_stats[term] = {
-                "term": term,
-                "first_seen": record["first_seen"],
-                "total_count": 0,
-                "sources": set(),
-                "arxiv_count": 0,
-                "hn_count": 0,
-                "github_count": 0,
-            }
-        
-        term_stats[term]["total_count"] += record["count"]
-        term_stats[term]["sources"].add(record["source"])
-        
-        if record["source"] == "arxiv":
-            term_stats[term]["arxiv_count"] += record["count"]
-        elif record["source"] == "hackernews":
-            term_stats[term]["hn_count"] += record["count"]
-        elif record["source"] == "github":
-            term_stats[term]["github_count"] += record["count"]
-    
-    # Calculate emergence score
-    cutoff = date.today() - timedelta(days=days)
-    
-    emerging = []
-    for term, stats in term_stats.items():
-        # Require minimum count
-        if stats["total_count"] < min_count:
-            continue
-        
-        # Calculate emergence score
-        score = 0
-        
-        # Bonus for being new (first seen within period)
-        first_seen = stats["first_seen"]
-        if isinstance(first_seen, str):
-            first_seen = date.fromisoformat(first_seen)
-        
-        if first_seen >= cutoff:
-            score += 50  # Big bonus for truly new terms
-        
-        # Bonus for arXiv presence (academic = early signal)
-        if stats["arxiv_count"] > 0:
-            score += 20
-            # Extra bonus if arXiv-heavy (research term not yet mainstream)
-            arxiv_ratio = stats["arxiv_count"] / stats["total_count"]
-            if arxiv_ratio > 0.5:
-                score += 15  # Mostly academic = very early
-        
-        # Bonus for cross-source validation
-        source_count = len(stats["sources"])
-        if source_count >= 2:
-            score += 10 * source_count
-        
-        # Bonus for count (but diminishing - we don't want already-popular)
-        # Sweet spot is moderate count, not too high
-        if 5 <= stats["total_count"] <= 30:
-            score += 10  # Goldilocks zone
-        elif stats["total_count"] > 50:
-            score -= 10  # Penalty for already being popular
-        
-        stats["emergence_score"] = score
-        stats["source_count"] = source_count
-        stats["sources"] = list(stats["sources"])
-        stats["is_new"] = first_seen >= cutoff
-        
-        emerging.append(stats)
-    
-    # Sort by emergence score
-    emerging.sort(key=lambda x: x["emergence_score"], reverse=True)
-    
-    return emerging[:limit]
+    return _rank_emerging(_get_candidate_stats(days, min_count), days, limit)
 
 
 def get_arxiv_only_terms(days: int = 7, min_count: int = 2, limit: int = 20) -> List[Dict]:
@@ -284,45 +200,95 @@ def get_arxiv_only_terms(days: int = 7, min_count: int = 2, limit: int = 20) ->
     These are the earliest signals - academic research that hasn't
     hit practitioner awareness.
     """
-    all_data = get_all_terms_for_period(days=days)
-    
-    if not all_data:
-        return []
-    
-    # Group by term
-    term_stats = {}
-    for record in all_data:
+    arxiv_only = []
+    for record in get_source_only_terms("arxiv", days=days, min_count=min_count):
         term = record["term"]
         
-        if term.lower() in ESTABLISHED_TERMS:
+        # Terms are stored lowercased, so they're looked up as is
+        if term in ESTABLISHED_TERMS:
             continue
             
         if len(term) < 4:
             continue
-            
-        if term not in term_stats:
-            term_stats[term] = {
-                "term": term,
-                "first_seen": record["first_seen"],
-                "arxiv_count": 0,
-                "other_count": 0,
-            }
         
-        if record["source"] == "arxiv":
-            term_stats[term]["arxiv_count"] += record["count"]
-        else:
-            term_stats[term]["other_count"] += record["count"]
+        arxiv_only.append(_arxiv_only_entry(record))
+        
+        if len(arxiv_only) == limit:
+            break
     
-    # Filter to arXiv-only terms
-    arxiv_only = []
-    for term, stats in term_stats.items():
-        if stats["arxiv_count"] >= min_count and stats["other_count"] == 0:
-            arxiv_only.append({
-                "term": term,
-                "count": stats["arxiv_count"],
-                "first_seen": stats["first_seen"],
-                "signal": "arxiv_only"
-            })
-    
-    arxiv_only.sort(key=lambda x: x["count"], reverse=True)
-    return arxiv_only[:limit]
+    return arxiv_only
+
+
+def compute_all_emergence_views(
+    days: int = 7, min_count: int = 2, limit_emerging: int = 30, limit_arxiv: int = 20
+) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Get both the emerging terms and the arXiv-only terms from one query.
+    
+    Same results as get_emerging_terms and get_arxiv_only_terms, for
+    reports that show both: the per-term totals are aggregated once and
+    each view is taken from them.
+    
+    Returns:
+        Tuple of (emerging terms, arXiv-only terms)
+    """
+    stats = _get_candidate_stats(days, min_count)
+    
+    # Rows arrive sorted by count, as get_source_only_terms returns them
+    arxiv_only = [
+        _arxiv_only_entry(row)
+        for row in stats
+        if row["sources"] == ["arxiv"]
+    ][:limit_arxiv]
+    
+    return _rank_emerging(stats, days, limit_emerging), arxiv_only
+
+
+def _get_candidate_stats(days: int, min_count: int) -> List[Dict]:
+    """Per-term totals for the period, without very short (likely noise) or established terms."""
+    return get_term_aggregates_for_period(
+        days=days, min_count=min_count, min_length=4, exclude=ESTABLISHED_TERMS
+    )
+
+
+def _rank_emerging(rows: List[Dict], days: int, limit: int) -> List[Dict]:
+    """Score per-term totals for emergence and return the top `limit`."""
+    # Checked before building the frame: with no records there's no
+    # "term" column to index by
+    if not rows:
+        return []
+    
+    # Imported here so report commands that never score terms (--help,
+    # --term, the trending report) don't pay for loading pandas
+    import numpy as np
+    import pandas as pd
+    
+    stats = pd.DataFrame.from_records(rows, index="term")
+    
+    # Calculate emergence score, for all terms at once (first_seen ISO
+    # strings are parsed to day numbers in one vectorized conversion)
+    cutoff = np.datetime64(date.today() - timedelta(days=days), "D")
+    is_new = stats["first_seen"].to_numpy().astype("datetime64[D]") >= cutoff
+    score = emergence_scores(
+        stats["total_count"].to_numpy(),
+        stats["arxiv_count"].to_numpy(),
+        stats["source_count"].to_numpy(),
+        is_new,
+    )
+    
+    stats = stats.assign(emergence_score=score, is_new=is_new)
+    
+    # Top terms by emergence score (ties keep the query's order: by count)
+    top = stats.nlargest(limit, "emergence_score", keep="first")
+    
+    return top.reset_index().to_dict("records")
+
+
+def _arxiv_only_entry(record: Dict) -> Dict:
+    """An arXiv-only term as reported, from its per-term totals."""
+    return {
+        "term": record["term"],
+        "count": record["total_count"],
+        "first_seen": record["first_seen"],
+        "signal": "arxiv_only"
+    }
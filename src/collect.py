@@ -1,28 +1,35 @@
 """Main collection script - run this to collect from all sources."""
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
-from pathlib import Path
-import sys
+from heapq import nlargest
+from typing import List
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from src.collectors import HackerNewsCollector, ArxivCollector, GitHubCollector
-from src.processing import TermExtractor
-from src.database import init_database, store_terms
+from src.database import init_database, store_terms, close_connection
 from src.database.queries import log_collection_run
 
+# Collector class for each source; collectors (and spaCy) are imported only
+# once we know what's being collected, which keeps --help fast
+COLLECTOR_CLASSES = {
+    "hackernews": "HackerNewsCollector",
+    "arxiv": "ArxivCollector",
+    "github": "GitHubCollector",
+}
+
+
+def get_collector(source_name: str):
+    """Import and construct the collector for a source."""
+    from src import collectors
+    return getattr(collectors, COLLECTOR_CLASSES[source_name])()
+
 
-def collect_source(source_name: str, collector, extractor: TermExtractor):
-    """Collect and process data from a single source."""
+def collect_source(source_name: str, texts: List[str], extractor, collection_date: date = None):
+    """Process the texts collected from a single source."""
     print(f"\n{'='*50}")
-    print(f"Collecting from: {source_name}")
+    print(f"Processing: {source_name}")
     print('='*50)
     
-    # Collect raw texts
-    texts = collector.collect()
-    
     if not texts:
         print(f"No texts collected from {source_name}")
         return
@@ -34,14 +41,14 @@ def collect_source(source_name: str, collector, extractor: TermExtractor):
     print(f"Found {len(terms)} unique terms")
     
     # Store in database
-    stored = store_terms(source_name, terms)
+    stored = store_terms(source_name, terms, collection_date=collection_date)
     print(f"Stored {stored} terms in database")
     
     # Log the run
-    log_collection_run(source_name, len(texts), len(terms))
+    log_collection_run(source_name, len(texts), len(terms), run_date=collection_date)
     
     # Show top terms
-    top_terms = sorted(terms.items(), key=lambda x: x[1], reverse=True)[:10]
+    top_terms = nlargest(10, terms.items(), key=lambda x: x[1])
     print(f"\nTop terms from {source_name}:")
     for term, count in top_terms:
         print(f"  {count:3d} | {term}")
@@ -60,29 +67,38 @@ def main():
     # Initialize database
     init_database()
     
-    # Initialize extractor (shared across sources)
-    extractor = TermExtractor()
-    
-    # Define collectors
-    collectors = {
-        "hackernews": HackerNewsCollector(),
-        "arxiv": ArxivCollector(),
-        "github": GitHubCollector(),
-    }
+    # One date for the whole run, so every source lands on the same day
+    today = date.today()
     
     # Collect from selected sources
     if args.source == "all":
-        sources_to_collect = collectors.keys()
+        sources_to_collect = list(COLLECTOR_CLASSES)
     else:
         sources_to_collect = [args.source]
     
-    for source_name in sources_to_collect:
-        collector = collectors[source_name]
-        collect_source(source_name, collector, extractor)
+    print(f"Collecting from: {', '.join(sources_to_collect)}")
+    
+    # Each source is a different host, so fetch them all concurrently. Term
+    # extraction and storage stay on this thread (spaCy and the DB connection
+    # aren't shared), overlapping with whatever fetches are still running.
+    with ThreadPoolExecutor(max_workers=len(sources_to_collect)) as executor:
+        fetches = {
+            source_name: executor.submit(get_collector(source_name).collect)
+            for source_name in sources_to_collect
+        }
+        
+        # Initialize extractor (shared across sources) while fetches run
+        from src.processing import TermExtractor
+        extractor = TermExtractor()
+        
+        for source_name, fetch in fetches.items():
+            collect_source(source_name, fetch.result(), extractor, collection_date=today)
+    
+    close_connection()
     
     print(f"\n{'='*50}")
     print("Collection complete!")
-    print(f"Date: {date.today()}")
+    print(f"Date: {today}")
     print('='*50)
 
 
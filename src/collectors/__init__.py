@@ -1,7 +1,19 @@
 """Data collectors for various sources."""
 
-from .hackernews import HackerNewsCollector
-from .arxiv import ArxivCollector
-from .github import GitHubCollector
+from importlib import import_module
+
+# Collectors are imported on first access, so using one source doesn't pull
+# in every other source's HTTP/parsing dependencies
+_COLLECTOR_MODULES = {
+    "HackerNewsCollector": ".hackernews",
+    "ArxivCollector": ".arxiv",
+    "GitHubCollector": ".github",
+}
 
 __all__ = ["HackerNewsCollector", "ArxivCollector", "GitHubCollector"]
+
+
+def __getattr__(name):
+    if name in _COLLECTOR_MODULES:
+        return getattr(import_module(_COLLECTOR_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
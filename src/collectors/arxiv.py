@@ -1,13 +1,9 @@
 """arXiv paper collector using the arxiv API."""
 
 import arxiv
+from itertools import chain
 from typing import List
-from datetime import datetime, timedelta
-from pathlib import Path
-import sys
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import ARXIV_PAPERS_PER_RUN, ARXIV_CATEGORIES
 
 
@@ -24,14 +20,17 @@ class ArxivCollector:
         Returns:
             List of text strings (titles + abstracts)
         """
-        texts = []
         papers_per_category = ARXIV_PAPERS_PER_RUN // len(ARXIV_CATEGORIES)
         
         print(f"Collecting papers from {len(ARXIV_CATEGORIES)} arXiv categories...")
         
-        for category in ARXIV_CATEGORIES:
-            category_texts = self._collect_category(category, papers_per_category)
-            texts.extend(category_texts)
+        # Categories are fetched one at a time on purpose: the arXiv API asks
+        # for at most one request every 3 seconds, which the client enforces
+        # between its own calls but not across threads
+        texts = list(chain.from_iterable(
+            self._collect_category(category, papers_per_category)
+            for category in ARXIV_CATEGORIES
+        ))
         
         print(f"Collected {len(texts)} text items from arXiv")
         return texts
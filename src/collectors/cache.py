@@ -0,0 +1,63 @@
+"""On-disk cache for collector responses."""
+
+import hashlib
+import os
+import threading
+import time
+import orjson
+from pathlib import Path
+from typing import Any, Optional
+
+from config import CACHE_DIR
+
+
+class FileCache:
+    """JSON-on-disk cache with a fixed time-to-live per entry."""
+    
+    def __init__(self, name: str, ttl: float):
+        """
+        Args:
+            name: Subdirectory of CACHE_DIR holding this cache's entries
+            ttl: Seconds an entry stays valid after it was written
+        """
+        self.directory = CACHE_DIR / name
+        self.ttl = ttl
+    
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.directory / f"{digest}.json"
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return orjson.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+    
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value (atomically, so readers never see partial files)."""
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(orjson.dumps(value))
+            tmp.replace(path)
+        except OSError as e:
+            print(f"Error writing cache entry {key}: {e}")
+    
+    def prune(self):
+        """Delete expired entries."""
+        cutoff = time.time() - self.ttl
+        try:
+            entries = list(self.directory.iterdir())
+        except OSError:
+            return
+        for path in entries:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
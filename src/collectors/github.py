@@ -1,14 +1,24 @@
 """GitHub trending repositories collector."""
 
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from lxml import etree, html
 from typing import List
-from pathlib import Path
-import sys
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import GITHUB_REPOS_PER_RUN
+from src.collectors.session import make_session
+
+# Repository cards and the parts of each card, as precompiled XPath queries
+# (class tests match one whitespace-separated class, like a CSS selector)
+ARTICLE_XPATH = etree.XPath('//article[contains(concat(" ", normalize-space(@class), " "), " Box-row ")]')
+NAME_XPATH = etree.XPath('(.//h2)[1]')
+DESCRIPTION_XPATH = etree.XPath('(.//p)[1]')
+TOPIC_XPATH = etree.XPath('.//a[contains(concat(" ", normalize-space(@class), " "), " topic-tag ")]')
+
+
+def _text(element) -> str:
+    """An element's text with each piece stripped, as BeautifulSoup's get_text(strip=True)."""
+    return "".join(piece.strip() for piece in element.itertext())
 
 
 class GitHubCollector:
@@ -16,9 +26,14 @@ class GitHubCollector:
     
     TRENDING_URL = "https://github.com/trending"
     
+    # Time ranges collected across all languages
+    PERIODS = ("daily", "weekly")
+    
+    # Languages whose daily trending lists are collected as well
+    LANGUAGES = ("python", "javascript", "typescript", "rust", "go")
+    
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = make_session({
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         })
     
@@ -29,25 +44,18 @@ class GitHubCollector:
         Returns:
             List of text strings (repo names + descriptions)
         """
-        texts = []
-        
-        # Collect from different time ranges
-        for period in ["daily", "weekly"]:
-            period_texts = self._collect_trending(period)
-            texts.extend(period_texts)
+        # Different time ranges across all languages, then specific
+        # languages' daily lists
+        pages = [(period, None) for period in self.PERIODS]
+        pages += [("daily", language) for language in self.LANGUAGES]
         
-        # Collect from specific languages
-        for language in ["python", "javascript", "typescript", "rust", "go"]:
-            lang_texts = self._collect_trending("daily", language)
-            texts.extend(lang_texts)
+        # The pages are independent and network-bound, so they're fetched
+        # concurrently (map keeps their results in this order)
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            texts = list(chain.from_iterable(executor.map(lambda page: self._collect_trending(*page), pages)))
         
         # Remove duplicates while preserving order
-        seen = set()
-        unique_texts = []
-        for text in texts:
-            if text not in seen:
-                seen.add(text)
-                unique_texts.append(text)
+        unique_texts = list(dict.fromkeys(texts))
         
         print(f"Collected {len(unique_texts)} text items from GitHub Trending")
         return unique_texts[:GITHUB_REPOS_PER_RUN * 2]  # name + description per repo
@@ -66,32 +74,29 @@ class GitHubCollector:
             response = self.session.get(url, params=params)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, "lxml")
+            tree = html.fromstring(response.text)
             
             # Find repository articles
-            articles = soup.find_all("article", class_="Box-row")
+            articles = ARTICLE_XPATH(tree)
             
             for article in articles:
                 # Get repo name
-                name_elem = article.find("h2")
-                if name_elem:
-                    repo_name = name_elem.get_text(strip=True).replace(" ", "").replace("\n", "")
+                for name_elem in NAME_XPATH(article):
+                    repo_name = _text(name_elem).replace(" ", "").replace("\n", "")
                     # Just the repo name without owner
                     if "/" in repo_name:
                         repo_name = repo_name.split("/")[-1]
                     texts.append(repo_name)
                 
                 # Get description
-                desc_elem = article.find("p")
-                if desc_elem:
-                    description = desc_elem.get_text(strip=True)
+                for desc_elem in DESCRIPTION_XPATH(article):
+                    description = _text(desc_elem)
                     if description:
                         texts.append(description)
                 
                 # Get topics/tags if present
-                topic_tags = article.find_all("a", class_="topic-tag")
-                for tag in topic_tags:
-                    topic = tag.get_text(strip=True)
+                for tag in TOPIC_XPATH(article):
+                    topic = _text(tag)
                     if topic:
                         texts.append(topic)
             
@@ -1,22 +1,46 @@
 """Hacker News collector using the official API."""
 
-import requests
+import html
+import re
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
-from pathlib import Path
-import sys
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import HACKERNEWS_STORIES_PER_RUN
+from src.collectors.cache import FileCache
+from src.collectors.session import POOL_SIZE, make_session
+
+# Story and comment text is HTML (paragraph tags, links, escaped quotes)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# Decoded angle brackets become spaces: the extractor's cleanup would take
+# the text between a "&lt;" and a later "&gt;" for a tag and delete it
+ANGLE_BRACKETS = str.maketrans("<>", "  ")
+
+
+def _strip_html(text: str) -> str:
+    """Plain text from an item's HTML: tags dropped, then entities decoded."""
+    return html.unescape(TAG_PATTERN.sub(' ', text)).translate(ANGLE_BRACKETS)
 
 
 class HackerNewsCollector:
     """Collect stories and comments from Hacker News."""
     
     BASE_URL = "https://hacker-news.firebaseio.com/v0"
+    ITEM_URL = BASE_URL + "/item/%d.json"
+    
+    # Comments rarely change once posted, and top stories keep the same top
+    # comments for days, so they're cached rather than re-fetched each run
+    COMMENT_CACHE_TTL = 3 * 24 * 60 * 60
+    
+    # Stories stay on the top/new lists across runs; their titles and text
+    # don't change, but their top comments can, so they're kept for less
+    STORY_CACHE_TTL = 6 * 60 * 60
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = make_session()
+        self.story_cache = FileCache("hackernews_stories", ttl=self.STORY_CACHE_TTL)
+        self.comment_cache = FileCache("hackernews_comments", ttl=self.COMMENT_CACHE_TTL)
     
     def collect(self) -> List[str]:
         """
@@ -37,23 +61,36 @@ class HackerNewsCollector:
         
         print(f"Collecting {len(all_ids)} HN stories...")
         
-        for story_id in all_ids:
-            story = self._get_item(story_id)
-            if story:
-                # Add title
-                if story.get("title"):
-                    texts.append(story["title"])
-                
-                # Add text if it's an Ask HN or Show HN
-                if story.get("text"):
-                    texts.append(story["text"])
-                
-                # Get top comments for more context
-                if story.get("kids"):
-                    for comment_id in story["kids"][:3]:  # Top 3 comments
-                        comment = self._get_item(comment_id)
-                        if comment and comment.get("text"):
-                            texts.append(comment["text"])
+        # Item fetches are network-bound, so they run on a thread pool sized
+        # to the session's connection pool: stories first, then every
+        # story's top comments in one batch
+        with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+            stories = [story for story in executor.map(self._get_story, all_ids) if story]
+            
+            # Top 3 comments per story for more context
+            comment_ids = [
+                comment_id
+                for story in stories
+                for comment_id in story.get("kids", ())[:3]
+            ]
+            comments = dict(zip(comment_ids, executor.map(self._get_comment, comment_ids)))
+        
+        for story in stories:
+            # Add title
+            if story.get("title"):
+                texts.append(story["title"])
+            
+            # Add text if it's an Ask HN or Show HN
+            if story.get("text"):
+                texts.append(_strip_html(story["text"]))
+            
+            for comment_id in story.get("kids", ())[:3]:
+                comment = comments[comment_id]
+                if comment and comment.get("text"):
+                    texts.append(_strip_html(comment["text"]))
+        
+        self.story_cache.prune()
+        self.comment_cache.prune()
         
         print(f"Collected {len(texts)} text items from Hacker News")
         return texts
@@ -63,17 +100,35 @@ class HackerNewsCollector:
         try:
             response = self.session.get(f"{self.BASE_URL}/{endpoint}.json")
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             print(f"Error fetching {endpoint}: {e}")
             return []
     
+    def _get_story(self, story_id: int) -> Dict:
+        """Get a story, from the cache if it was fetched recently."""
+        return self._get_cached_item(self.story_cache, story_id)
+    
+    def _get_comment(self, comment_id: int) -> Dict:
+        """Get a comment, from the cache if it was fetched recently."""
+        return self._get_cached_item(self.comment_cache, comment_id)
+    
+    def _get_cached_item(self, cache: FileCache, item_id: int) -> Dict:
+        """Get an item through a cache, storing it if it had to be fetched."""
+        key = str(item_id)
+        item = cache.get(key)
+        if item is None:
+            item = self._get_item(item_id)
+            if item:
+                cache.set(key, item)
+        return item
+    
     def _get_item(self, item_id: int) -> Dict:
         """Get a single item (story or comment) by ID."""
         try:
-            response = self.session.get(f"{self.BASE_URL}/item/{item_id}.json")
+            response = self.session.get(self.ITEM_URL % item_id)
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except Exception as e:
             print(f"Error fetching item {item_id}: {e}")
             return {}
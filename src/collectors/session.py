@@ -0,0 +1,46 @@
+"""Shared HTTP session setup for collectors."""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict
+
+# Keep-alive connections held per host (requests' default is 10)
+POOL_SIZE = 16
+
+# Longest wait honoured from a Retry-After header; a server asking for more
+# (rate limits can say hours) would otherwise stall the whole collection run
+MAX_RETRY_AFTER = 60
+
+
+class CappedRetry(Retry):
+    """Retry policy that waits at most MAX_RETRY_AFTER for a Retry-After header."""
+    
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), MAX_RETRY_AFTER)
+
+
+# Transient failures are retried with exponential backoff (urllib3 retries
+# the first at once, then sleeps 2s and 4s), or after the server's
+# Retry-After, capped at MAX_RETRY_AFTER, when it sends one
+RETRY = CappedRetry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    respect_retry_after_header=True,
+)
+
+
+def make_session(headers: Dict[str, str] = None) -> requests.Session:
+    """Create a session whose connections are pooled, reused and retried."""
+    session = requests.Session()
+    
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    if headers:
+        session.headers.update(headers)
+    
+    return session
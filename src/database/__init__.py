@@ -1,18 +1,27 @@
 """Database module for keyword storage and retrieval."""
 
-from .init import init_database, get_connection
+from .init import init_database, get_connection, close_connection
 from .queries import (
     store_terms,
     get_term_history,
+    get_term_summary,
     get_trending_terms,
+    get_trending_terms_per_source,
     get_all_terms_for_period,
+    get_term_aggregates_for_period,
+    get_source_only_terms,
 )
 
 __all__ = [
     "init_database",
     "get_connection", 
+    "close_connection",
     "store_terms",
     "get_term_history",
+    "get_term_summary",
     "get_trending_terms",
+    "get_trending_terms_per_source",
     "get_all_terms_for_period",
+    "get_term_aggregates_for_period",
+    "get_source_only_terms",
 ]
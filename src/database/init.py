@@ -1,97 +1,218 @@
 """Database initialization and connection management."""
 
+import atexit
 import sqlite3
-from pathlib import Path
-import sys
+import threading
+from typing import Set
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from config import DATABASE_PATH
+from config import DATABASE_PATH, ensure_dirs
+
+
+# Per-connection settings, applied whenever the connection is opened
+CONNECTION_PRAGMAS = (
+    # With WAL (set by init_database), NORMAL only syncs at checkpoints,
+    # not on every commit, and still can't corrupt the database
+    "synchronous=NORMAL",
+    # Sorts and GROUP BY temp tables stay in memory
+    "temp_store=MEMORY",
+    # 64 MB page cache (negative = KiB) instead of the default 2 MB
+    "cache_size=-65536",
+    # Read the database through a 256 MB memory map rather than read() calls
+    "mmap_size=268435456",
+    # Enforce the schema's foreign keys (off by default in SQLite)
+    "foreign_keys=ON",
+)
+
+# One connection per thread, opened on first use and kept for the life of
+# the thread, so its page cache stays warm across queries
+_local = threading.local()
+
+# Every open connection, so they can all be closed at exit
+_connections: Set[sqlite3.Connection] = set()
+_connections_lock = threading.Lock()
 
 
 def get_connection() -> sqlite3.Connection:
-    """Get a database connection."""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
+    """Get this thread's database connection, opening it on first use."""
+    conn = getattr(_local, "connection", None)
+    if conn is None:
+        ensure_dirs()
+        # Only ever used by this thread, but closed from the main thread at exit
+        conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+        _local.connection = conn
+        with _connections_lock:
+            _connections.add(conn)
     return conn
 
 
+def _close(conn: sqlite3.Connection):
+    """Close a connection, first letting SQLite refresh stale planner statistics."""
+    # Cheap when nothing needs doing: only tables this connection queried,
+    # and whose statistics are missing or out of date, get analyzed
+    conn.execute("PRAGMA optimize")
+    conn.close()
+
+
+def close_connection():
+    """Close this thread's database connection, if it has one."""
+    conn = getattr(_local, "connection", None)
+    if conn is not None:
+        _local.connection = None
+        with _connections_lock:
+            _connections.discard(conn)
+        _close(conn)
+
+
+@atexit.register
+def _close_all_connections():
+    """Close whatever connections are still open when the process exits."""
+    with _connections_lock:
+        connections = list(_connections)
+        _connections.clear()
+    for conn in connections:
+        _close(conn)
+
+
 def init_database():
     """Initialize the database schema."""
     conn = get_connection()
     cursor = conn.cursor()
     
-    # Sources table - where data comes from
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sources (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE NOT NULL,
-            description TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Terms table - unique terms we're tracking
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS terms (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            term TEXT UNIQUE NOT NULL,
-            first_seen DATE NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    # Term occurrences - count of term by source by date
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS term_occurrences (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            term_id INTEGER NOT NULL,
-            source_id INTEGER NOT NULL,
-            date DATE NOT NULL,
-            count INTEGER DEFAULT 1,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (term_id) REFERENCES terms(id),
-            FOREIGN KEY (source_id) REFERENCES sources(id),
-            UNIQUE(term_id, source_id, date)
-        )
-    """)
-    
-    # Collection runs - track when we collected data
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS collection_runs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            source_id INTEGER NOT NULL,
-            date DATE NOT NULL,
-            items_collected INTEGER DEFAULT 0,
-            terms_extracted INTEGER DEFAULT 0,
-            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP,
-            FOREIGN KEY (source_id) REFERENCES sources(id)
-        )
-    """)
+    # Write-ahead logging: commits append to the log instead of rewriting
+    # pages in place, and readers don't block the writer (the mode is
+    # stored in the database file, so this only needs doing once)
+    cursor.execute("PRAGMA journal_mode=WAL")
     
-    # Create indexes for faster queries
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_terms_term ON terms(term)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_occurrences_date ON term_occurrences(date)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_occurrences_term ON term_occurrences(term_id)")
+    # Indexes that already exist, to tell whether this run creates any
+    existing_indexes = {
+        row["name"] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
     
-    # Insert default sources
-    sources = [
-        ("hackernews", "Hacker News - Tech community discussions"),
-        ("arxiv", "arXiv - Academic CS/AI papers"),
-        ("github", "GitHub Trending - Popular repositories"),
-    ]
-    
-    for name, description in sources:
-        cursor.execute(
-            "INSERT OR IGNORE INTO sources (name, description) VALUES (?, ?)",
-            (name, description)
+    # Create the schema and seed it in one transaction (one commit, rather
+    # than one per statement), rolled back if any statement fails
+    with conn:
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Sources table - where data comes from
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sources (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Terms table - unique terms we're tracking
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS terms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                term TEXT UNIQUE NOT NULL,
+                first_seen DATE NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Term occurrences - count of term by source by date
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS term_occurrences (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                term_id INTEGER NOT NULL,
+                source_id INTEGER NOT NULL,
+                date DATE NOT NULL,
+                count INTEGER DEFAULT 1,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (term_id) REFERENCES terms(id),
+                FOREIGN KEY (source_id) REFERENCES sources(id),
+                UNIQUE(term_id, source_id, date)
+            )
+        """)
+        
+        # Daily term totals - term_occurrences rolled up across sources, kept
+        # in step by store_terms. source_mask has bit (1 << source_id) set for
+        # each source that mentioned the term that day. Keyed date first so a
+        # period is one range of the table itself
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS term_daily (
+                date DATE NOT NULL,
+                term_id INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                source_mask INTEGER NOT NULL,
+                PRIMARY KEY (date, term_id),
+                FOREIGN KEY (term_id) REFERENCES terms(id)
+            ) WITHOUT ROWID
+        """)
+        
+        # Collection runs - track when we collected data
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS collection_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source_id INTEGER NOT NULL,
+                date DATE NOT NULL,
+                items_collected INTEGER DEFAULT 0,
+                terms_extracted INTEGER DEFAULT 0,
+                started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed_at TIMESTAMP,
+                FOREIGN KEY (source_id) REFERENCES sources(id)
+            )
+        """)
+        
+        # Create indexes for faster queries (terms.term is already indexed by its
+        # UNIQUE constraint; a second index on it only slows inserts)
+        cursor.execute("DROP INDEX IF EXISTS idx_terms_term")
+        
+        # Covering index for period scans: every row of a date range, with the
+        # columns the reports aggregate, read from the index alone (supersedes
+        # the old date-only index, which sent each row back to the table)
+        cursor.execute("DROP INDEX IF EXISTS idx_occurrences_date")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_occurrences_date_term
+            ON term_occurrences(date, term_id, source_id, count)
+        """)
+        
+        # Covering index: term history is served from the index alone, without
+        # fetching rows from the table (supersedes the old term_id-only index)
+        cursor.execute("DROP INDEX IF EXISTS idx_occurrences_term")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_occurrences_term_date
+            ON term_occurrences(term_id, date, source_id, count)
+        """)
+        
+        # Fill the rollup from occurrences stored before it existed (a term
+        # has one occurrence row per source and date, so summing the bits ORs them)
+        cursor.execute("""
+            INSERT INTO term_daily (date, term_id, count, source_mask)
+            SELECT date, term_id, SUM(count), SUM(1 << source_id)
+            FROM term_occurrences
+            WHERE NOT EXISTS (SELECT 1 FROM term_daily)
+            GROUP BY date, term_id
+        """)
+        
+        # Insert default sources
+        sources = [
+            ("hackernews", "Hacker News - Tech community discussions"),
+            ("arxiv", "arXiv - Academic CS/AI papers"),
+            ("github", "GitHub Trending - Popular repositories"),
+        ]
+        
+        cursor.executemany(
+            "INSERT OR IGNORE INTO sources (name, description) VALUES (?, ?)", sources
         )
     
-    conn.commit()
-    conn.close()
+    # Gather planner statistics when indexes were just added, so the covering
+    # indexes get picked on an existing database; a full ANALYZE on every
+    # run would only get slower as the database grows
+    indexes = {
+        row["name"] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    if indexes - existing_indexes:
+        cursor.execute("ANALYZE")
     print(f"Database initialized at {DATABASE_PATH}")
 
 
 if __name__ == "__main__":
     init_database()
+    close_connection()
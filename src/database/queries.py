@@ -1,25 +1,155 @@
 """Database query functions."""
 
+import json
 import sqlite3
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from .init import get_connection
 
+# SQLite's default cap on bound parameters per statement
+SQLITE_MAX_VARIABLES = 999
+
+# INSERT ... RETURNING needs SQLite 3.35+; on older builds store_terms looks
+# up every term's id instead
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _chunked(items: List, size: int) -> Iterator[List]:
+    """Split a list into consecutive slices of at most `size` items."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _plain_cursor(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """A cursor that returns plain tuples, for reads passed to _dict_rows."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+def _dict_rows(cursor: sqlite3.Cursor) -> Iterator[Dict]:
+    """
+    Rows of an executed plain cursor as dicts.
+    
+    Each tuple is zipped with the column names, read once per query,
+    which is cheaper than building a sqlite3.Row and converting that.
+    """
+    columns = tuple(column[0] for column in cursor.description)
+    return map(dict, map(zip, repeat(columns), cursor))
+
+
+# Batch statements for a given number of rows. sqlite3 already reuses the
+# compiled statement for repeated SQL text (its per-connection cache is
+# keyed by the text); caching the text too saves rebuilding a few KB of
+# placeholders for every chunk
+@lru_cache(maxsize=None)
+def _insert_terms_sql(rows: int) -> str:
+    values = ",".join(["(?, ?)"] * rows)
+    returning = " RETURNING id, term" if SQLITE_HAS_RETURNING else ""
+    return f"INSERT OR IGNORE INTO terms (term, first_seen) VALUES {values}{returning}"
+
+
+@lru_cache(maxsize=None)
+def _select_term_ids_sql(terms: int) -> str:
+    placeholders = ",".join("?" * terms)
+    return f"SELECT id, term FROM terms WHERE term IN ({placeholders})"
+
+
+@lru_cache(maxsize=None)
+def _upsert_occurrences_sql(rows: int) -> str:
+    values = ",".join(["(?, ?, ?, ?)"] * rows)
+    return f"""
+        INSERT INTO term_occurrences (term_id, source_id, date, count)
+        VALUES {values}
+        ON CONFLICT(term_id, source_id, date) 
+        DO UPDATE SET count = count + excluded.count
+    """
+
+
+@lru_cache(maxsize=None)
+def _upsert_daily_sql(rows: int) -> str:
+    values = ",".join(["(?, ?, ?, ?)"] * rows)
+    return f"""
+        INSERT INTO term_daily (date, term_id, count, source_mask)
+        VALUES {values}
+        ON CONFLICT(date, term_id) 
+        DO UPDATE SET
+            count = count + excluded.count,
+            source_mask = source_mask | excluded.source_mask
+    """
+
+
+def _period(days: int) -> Tuple[date, date]:
+    """
+    First and last dates of the period covering the last `days` days.
+    
+    Queries filter on BETWEEN both ends rather than an open-ended >=, so
+    date index range scans have a known upper bound.
+    """
+    today = date.today()
+    return today - timedelta(days=days), today
+
+
+# Source name -> id; the sources are seeded by init_database and never
+# change, so they're read once and kept for the life of the process
+_source_ids: Dict[str, int] = {}
+
+
+def _load_source_ids(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Read the sources table into the source id cache."""
+    cursor = conn.execute("SELECT name, id FROM sources ORDER BY id")
+    _source_ids.update((row["name"], row["id"]) for row in cursor)
+    return _source_ids
+
 
 def get_source_id(conn: sqlite3.Connection, source_name: str) -> int:
     """Get source ID by name."""
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM sources WHERE name = ?", (source_name,))
-    row = cursor.fetchone()
-    if row:
-        return row[0]
-    raise ValueError(f"Unknown source: {source_name}")
+    if source_name not in _source_ids:
+        _load_source_ids(conn)
+        if source_name not in _source_ids:
+            raise ValueError(f"Unknown source: {source_name}")
+    return _source_ids[source_name]
+
+
+def _source_mask_columns(conn: sqlite3.Connection) -> str:
+    """
+    Aggregate columns over term_daily rows: source_mask, the OR of the
+    rows' masks, and source_count, the number of bits set in it.
+    
+    SQLite has no bitwise-OR aggregate, so each source's bit is taken
+    with its own MAX.
+    """
+    source_ids = _source_ids or _load_source_ids(conn)
+    bits = [f"MAX(source_mask & {1 << source_id})" for source_id in source_ids.values()]
+    return (
+        f"{' | '.join(bits)} as source_mask, "
+        f"{' + '.join(f'({bit} > 0)' for bit in bits)} as source_count"
+    )
+
+
+def _source_names(conn: sqlite3.Connection, source_mask: int) -> List[str]:
+    """
+    Names of the sources whose bits are set in a source mask, in id order.
+    
+    Queries return a mask (bit 1 << source_id per source) rather than
+    GROUP_CONCAT(DISTINCT s.name), so SQLite doesn't build and dedupe a
+    string for every group.
+    """
+    source_ids = _source_ids or _load_source_ids(conn)
+    return [name for name, source_id in source_ids.items() if source_mask & (1 << source_id)]
 
 
 def store_terms(source_name: str, terms: Dict[str, int], collection_date: date = None):
     """
     Store extracted terms in the database.
     
+    All rows for the batch are written in a single BEGIN IMMEDIATE
+    transaction. New terms' ids come back from their INSERT ... RETURNING,
+    and existing terms' ids are resolved with chunked IN queries rather
+    than one SELECT per term.
+    
     Args:
         source_name: Name of the source (hackernews, arxiv, github)
         terms: Dictionary of term -> count
@@ -29,39 +159,68 @@ def store_terms(source_name: str, terms: Dict[str, int], collection_date: date =
         collection_date = date.today()
     
     conn = get_connection()
-    cursor = conn.cursor()
     source_id = get_source_id(conn, source_name)
     
-    terms_stored = 0
-    for term, count in terms.items():
-        # Insert or get term
-        cursor.execute(
-            "INSERT OR IGNORE INTO terms (term, first_seen) VALUES (?, ?)",
-            (term.lower(), collection_date)
-        )
-        cursor.execute("SELECT id FROM terms WHERE term = ?", (term.lower(),))
-        term_id = cursor.fetchone()[0]
+    # One transaction for the whole batch, rolled back if any write fails.
+    # IMMEDIATE takes the write lock up front: a deferred transaction that
+    # starts reading and then writes can fail with SQLITE_BUSY on the lock
+    # upgrade if another process is writing, without waiting for it
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
         
-        # Upsert occurrence count
-        cursor.execute("""
-            INSERT INTO term_occurrences (term_id, source_id, date, count)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(term_id, source_id, date) 
-            DO UPDATE SET count = count + excluded.count
-        """, (term_id, source_id, collection_date, count))
-        terms_stored += 1
+        # Insert any terms we haven't seen before, getting their ids back
+        # from RETURNING (which only yields rows that were actually inserted;
+        # without RETURNING support it yields none)
+        lowered = [term.lower() for term in terms]
+        unique_terms = list(dict.fromkeys(lowered))
+        term_ids = {}
+        for chunk in _chunked(unique_terms, SQLITE_MAX_VARIABLES // 2):
+            cursor.execute(
+                _insert_terms_sql(len(chunk)),
+                [param for term in chunk for param in (term, collection_date)]
+            )
+            term_ids.update((row["term"], row["id"]) for row in cursor)
+        
+        # Look up ids for the terms that already existed (or for every term,
+        # without RETURNING), staying under SQLite's bound-parameter limit
+        known_terms = [term for term in unique_terms if term not in term_ids]
+        for chunk in _chunked(known_terms, SQLITE_MAX_VARIABLES):
+            cursor.execute(_select_term_ids_sql(len(chunk)), chunk)
+            term_ids.update((row["term"], row["id"]) for row in cursor)
+        
+        # Upsert occurrence counts, packing as many rows into each statement
+        # as the bound-parameter limit allows (4 parameters per row)
+        occurrences = [
+            (term_ids[term], source_id, collection_date, count)
+            for term, count in zip(lowered, terms.values())
+        ]
+        for chunk in _chunked(occurrences, SQLITE_MAX_VARIABLES // 4):
+            cursor.execute(
+                _upsert_occurrences_sql(len(chunk)), [param for row in chunk for param in row]
+            )
+        
+        # Add the same counts to the daily rollup, with this source's bit
+        source_bit = 1 << source_id
+        for chunk in _chunked(occurrences, SQLITE_MAX_VARIABLES // 4):
+            cursor.execute(
+                _upsert_daily_sql(len(chunk)),
+                [
+                    param
+                    for term_id, _, occurrence_date, count in chunk
+                    for param in (occurrence_date, term_id, count, source_bit)
+                ]
+            )
     
-    conn.commit()
-    conn.close()
-    return terms_stored
+    return len(terms)
 
 
 def get_term_history(term: str, days: int = 30) -> List[Dict]:
     """Get occurrence history for a specific term."""
     conn = get_connection()
-    cursor = conn.cursor()
+    cursor = _plain_cursor(conn)
     
-    start_date = date.today() - timedelta(days=days)
+    start_date, end_date = _period(days)
     
     cursor.execute("""
         SELECT 
@@ -72,13 +231,42 @@ def get_term_history(term: str, days: int = 30) -> List[Dict]:
         FROM term_occurrences o
         JOIN terms t ON t.id = o.term_id
         JOIN sources s ON s.id = o.source_id
-        WHERE t.term = ? AND o.date >= ?
+        WHERE t.term = ? AND o.date BETWEEN ? AND ?
         ORDER BY o.date DESC
-    """, (term.lower(), start_date))
+    """, (term.lower(), start_date, end_date))
     
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    return list(_dict_rows(cursor))
+
+
+def get_term_summary(term: str, days: int = 30, velocity_days: int = 14) -> Dict:
+    """
+    Get a term's totals for a period, aggregated in SQL.
+    
+    Returns the total count and sources over the last `days`, and its
+    counts in the recent and older halves of the last `velocity_days`
+    (which should not exceed `days`).
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    start_date, today = _period(days)
+    velocity_start = today - timedelta(days=velocity_days)
+    midpoint = today - timedelta(days=velocity_days // 2)
+    
+    cursor.execute("""
+        SELECT 
+            COALESCE(SUM(o.count), 0) as total_count,
+            COALESCE(SUM(DISTINCT 1 << o.source_id), 0) as source_mask,
+            COALESCE(SUM(CASE WHEN o.date >= ? THEN o.count END), 0) as recent_count,
+            COALESCE(SUM(CASE WHEN o.date >= ? AND o.date < ? THEN o.count END), 0) as older_count
+        FROM term_occurrences o
+        JOIN terms t ON t.id = o.term_id
+        WHERE t.term = ? AND o.date BETWEEN ? AND ?
+    """, (midpoint, velocity_start, midpoint, term.lower(), start_date, today))
+    
+    result = dict(cursor.fetchone())
+    result["sources"] = _source_names(conn, result.pop("source_mask"))
+    return result
 
 
 def get_trending_terms(
@@ -94,54 +282,133 @@ def get_trending_terms(
     1. Total occurrences in the period
     2. Number of different sources mentioning it
     3. Recency (more recent = higher score)
+    
+    Across all sources, terms are ranked from the term_daily rollup (one
+    row per term and day rather than per source); a single source's
+    ranking needs its own counts, so it reads term_occurrences.
     """
     conn = get_connection()
-    cursor = conn.cursor()
+    cursor = _plain_cursor(conn)
     
-    start_date = date.today() - timedelta(days=days)
+    start_date, end_date = _period(days)
     
-    query = """
-        SELECT 
-            t.term,
-            t.first_seen,
-            SUM(o.count) as total_count,
-            COUNT(DISTINCT o.source_id) as source_count,
-            MAX(o.date) as last_seen,
-            GROUP_CONCAT(DISTINCT s.name) as sources
-        FROM term_occurrences o
-        JOIN terms t ON t.id = o.term_id
-        JOIN sources s ON s.id = o.source_id
-        WHERE o.date >= ?
+    if not source_name:
+        cursor.execute(f"""
+            SELECT 
+                t.term,
+                t.first_seen,
+                d.total_count,
+                d.source_count,
+                d.last_seen,
+                d.source_mask
+            FROM (
+                SELECT 
+                    term_id,
+                    SUM(count) as total_count,
+                    MAX(date) as last_seen,
+                    {_source_mask_columns(conn)}
+                FROM term_daily
+                WHERE date BETWEEN ? AND ?
+                GROUP BY term_id
+                HAVING total_count >= ?
+            ) d
+            JOIN terms t ON t.id = d.term_id
+            ORDER BY 
+                source_count DESC,
+                total_count DESC,
+                last_seen DESC
+            LIMIT ?
+        """, (start_date, end_date, min_occurrences, limit))
+    else:
+        cursor.execute("""
+            SELECT 
+                t.term,
+                t.first_seen,
+                SUM(o.count) as total_count,
+                COUNT(DISTINCT o.source_id) as source_count,
+                MAX(o.date) as last_seen,
+                SUM(DISTINCT 1 << o.source_id) as source_mask
+            FROM term_occurrences o
+            JOIN terms t ON t.id = o.term_id
+            JOIN sources s ON s.id = o.source_id
+            WHERE o.date BETWEEN ? AND ? AND s.name = ?
+            GROUP BY t.id
+            HAVING total_count >= ?
+            ORDER BY 
+                source_count DESC,
+                total_count DESC,
+                last_seen DESC
+            LIMIT ?
+        """, (start_date, end_date, source_name, min_occurrences, limit))
+    
+    results = list(_dict_rows(cursor))
+    for result in results:
+        result["sources"] = ",".join(_source_names(conn, result.pop("source_mask")))
+    return results
+
+
+def get_trending_terms_per_source(
+    days: int = 7,
+    min_occurrences: int = 2,
+    per_source_limit: int = 10
+) -> Dict[str, List[Dict]]:
     """
-    params = [start_date]
+    Get each source's top terms for a period, in one query.
     
-    if source_name:
-        query += " AND s.name = ?"
-        params.append(source_name)
+    Ranked as get_trending_terms ranks a single source (by total count,
+    then most recently seen); a window function numbers each source's
+    terms so the top ones for every source come back from one scan.
     
-    query += """
-        GROUP BY t.id
-        HAVING total_count >= ?
-        ORDER BY 
-            source_count DESC,
-            total_count DESC,
-            last_seen DESC
-        LIMIT ?
+    Returns:
+        Dictionary of source name -> ranked term rows
     """
-    params.extend([min_occurrences, limit])
+    conn = get_connection()
+    cursor = _plain_cursor(conn)
+    
+    start_date, end_date = _period(days)
     
-    cursor.execute(query, params)
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    cursor.execute("""
+        SELECT source, term, total_count, last_seen
+        FROM (
+            SELECT 
+                s.name as source,
+                t.term,
+                o.total_count,
+                o.last_seen,
+                ROW_NUMBER() OVER (
+                    PARTITION BY o.source_id
+                    ORDER BY o.total_count DESC, o.last_seen DESC, t.term
+                ) as rank
+            FROM (
+                -- The unary + keeps SQLite from grouping in the order of the
+                -- (term_id, source_id, date) unique index, which walks every
+                -- row ever stored; this way it reads just the period's range
+                -- of the covering date index
+                SELECT term_id, source_id, SUM(count) as total_count, MAX(date) as last_seen
+                FROM term_occurrences
+                WHERE date BETWEEN ? AND ?
+                GROUP BY +source_id, +term_id
+                HAVING total_count >= ?
+            ) o
+            JOIN terms t ON t.id = o.term_id
+            JOIN sources s ON s.id = o.source_id
+        )
+        WHERE rank <= ?
+        ORDER BY source, rank
+    """, (start_date, end_date, min_occurrences, per_source_limit))
+    
+    results = {}
+    for row in _dict_rows(cursor):
+        results.setdefault(row["source"], []).append(row)
     return results
 
 
 def get_all_terms_for_period(days: int = 7) -> List[Dict]:
     """Get all terms with counts for a period, for analysis."""
     conn = get_connection()
-    cursor = conn.cursor()
+    cursor = _plain_cursor(conn)
     
-    start_date = date.today() - timedelta(days=days)
+    start_date, end_date = _period(days)
     
     cursor.execute("""
         SELECT 
@@ -153,17 +420,93 @@ def get_all_terms_for_period(days: int = 7) -> List[Dict]:
         FROM term_occurrences o
         JOIN terms t ON t.id = o.term_id
         JOIN sources s ON s.id = o.source_id
-        WHERE o.date >= ?
+        WHERE o.date BETWEEN ? AND ?
         ORDER BY o.date DESC, o.count DESC
-    """, (start_date,))
+    """, (start_date, end_date))
     
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    return list(_dict_rows(cursor))
+
+
+def get_term_aggregates_for_period(
+    days: int = 7,
+    min_count: int = 1,
+    min_length: int = 1,
+    exclude: Iterable[str] = ()
+) -> List[Dict]:
+    """
+    Get per-term totals for a period, aggregated in SQL.
+    
+    One row per term with its total count, the sources that mentioned it
+    and a count per source, ordered by total count. Terms shorter than
+    min_length or listed in exclude are skipped.
+    """
+    conn = get_connection()
+    cursor = _plain_cursor(conn)
+    
+    start_date, end_date = _period(days)
+    
+    cursor.execute("""
+        SELECT 
+            t.term,
+            t.first_seen,
+            SUM(o.count) as total_count,
+            COUNT(DISTINCT o.source_id) as source_count,
+            SUM(DISTINCT 1 << o.source_id) as source_mask,
+            SUM(CASE WHEN s.name = 'arxiv' THEN o.count ELSE 0 END) as arxiv_count,
+            SUM(CASE WHEN s.name = 'hackernews' THEN o.count ELSE 0 END) as hn_count,
+            SUM(CASE WHEN s.name = 'github' THEN o.count ELSE 0 END) as github_count
+        FROM term_occurrences o
+        JOIN terms t ON t.id = o.term_id
+        JOIN sources s ON s.id = o.source_id
+        WHERE o.date BETWEEN ? AND ?
+            AND length(t.term) >= ?
+            AND t.term NOT IN (SELECT value FROM json_each(?))
+        GROUP BY t.id
+        HAVING total_count >= ?
+        ORDER BY total_count DESC, t.term
+    """, (start_date, end_date, min_length, json.dumps(list(exclude)), min_count))
+    
+    results = list(_dict_rows(cursor))
+    for result in results:
+        result["sources"] = _source_names(conn, result.pop("source_mask"))
     return results
 
 
-def log_collection_run(source_name: str, items: int, terms: int):
-    """Log a collection run."""
+def get_source_only_terms(source_name: str, days: int = 7, min_count: int = 2) -> List[Dict]:
+    """
+    Get terms seen only in one source during a period.
+    
+    The per-source split is done in SQL with CASE sums, so only terms that
+    qualify come back, ordered by count.
+    """
+    conn = get_connection()
+    cursor = _plain_cursor(conn)
+    
+    start_date, end_date = _period(days)
+    
+    cursor.execute("""
+        SELECT 
+            t.term,
+            t.first_seen,
+            SUM(CASE WHEN s.name = ? THEN o.count ELSE 0 END) as total_count,
+            SUM(CASE WHEN s.name = ? THEN 0 ELSE o.count END) as other_count
+        FROM term_occurrences o
+        JOIN terms t ON t.id = o.term_id
+        JOIN sources s ON s.id = o.source_id
+        WHERE o.date BETWEEN ? AND ?
+        GROUP BY t.id
+        HAVING other_count = 0 AND total_count >= ?
+        ORDER BY total_count DESC, t.term
+    """, (source_name, source_name, start_date, end_date, min_count))
+    
+    return list(_dict_rows(cursor))
+
+
+def log_collection_run(source_name: str, items: int, terms: int, run_date: date = None):
+    """Log a collection run (run_date defaults to today)."""
+    if run_date is None:
+        run_date = date.today()
+    
     conn = get_connection()
     cursor = conn.cursor()
     source_id = get_source_id(conn, source_name)
@@ -171,7 +514,6 @@ def log_collection_run(source_name: str, items: int, terms: int):
     cursor.execute("""
         INSERT INTO collection_runs (source_id, date, items_collected, terms_extracted, completed_at)
         VALUES (?, ?, ?, ?, ?)
-    """, (source_id, date.today(), items, terms, datetime.now()))
+    """, (source_id, run_date, items, terms, datetime.now()))
     
     conn.commit()
-    conn.close()
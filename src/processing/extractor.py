@@ -2,14 +2,46 @@
 
 import re
 from collections import Counter
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Optional
 import spacy
-from pathlib import Path
+from spacy.symbols import ADJ, NOUN, PROPN
 import sys
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from config import MIN_TERM_LENGTH, MAX_TERM_LENGTH, MIN_TERM_FREQUENCY, STOP_TERMS
+from config import (
+    MIN_TERM_LENGTH, MAX_TERM_LENGTH, MIN_TERM_FREQUENCY, STOP_TERMS,
+    SPACY_BATCH_SIZE, MAX_TEXT_CHARS,
+)
+
+# Pipeline components the extractor never uses
+SPACY_EXCLUDE = ["parser", "ner"]
+
+# Parts of speech worth extracting as single-token terms (spaCy symbol IDs,
+# so tokens are checked without building their tag strings)
+VALID_POS = frozenset({NOUN, PROPN, ADJ})
+
+# Any letter (a word character that isn't a digit or underscore)
+LETTER_PATTERN = re.compile(r'[^\W\d_]')
+
+# Text cleanup patterns, applied in order by _clean_text
+MARKUP_PATTERN = re.compile(r'&#?x?[0-9a-fA-F]+;?|&\w+;|<[^>]+>')
+URL_PATTERN = re.compile(r'https?://\S+')
+WWW_PATTERN = re.compile(r'www\.\S+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+NOISE_PATTERN = re.compile(
+    r'\b(?:href|nofollow|rel|http|https|www|com|org|net|io)\b|[^\w\s\-]+|\b\w\b'
+)
+
+# Common tech compound patterns, each scanned separately over the lowercased
+# text (so no case folding per character): findall never returns overlapping
+# matches, so one combined pattern would stop counting the parts of a
+# hyphenated word, or the "bar.js" in "foo-bar.js", as terms of their own.
+# The CamelCase pattern has always matched case-insensitively, so in effect
+# it takes any word starting with three letters, which also counts plain words
+COMPOUND_PATTERNS = (
+    re.compile(r'\b\w+-\w+\b'),                   # Hyphenated terms like "open-source"
+    re.compile(r'\b\w+\.(?:js|py|ai)\b'),          # Tech frameworks
+    re.compile(r'\b[a-z][a-z]+[a-z]\w+\b'),        # CamelCase terms
+)
 
 
 class TermExtractor:
@@ -17,34 +49,57 @@ class TermExtractor:
     
     def __init__(self):
         """Initialize the extractor with spaCy model."""
+        # Only tagging and lemmas are used; excluding the parser and NER at
+        # load time skips reading their weights as well as running them
         try:
-            self.nlp = spacy.load("en_core_web_sm")
+            self.nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
         except OSError:
             print("Downloading spaCy model...")
             import subprocess
             subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
-        
-        # Disable unnecessary pipeline components for speed
-        self.nlp.disable_pipes(["parser", "ner"])
+            self.nlp = spacy.load("en_core_web_sm", exclude=SPACY_EXCLUDE)
         
         self.stop_terms = STOP_TERMS
+        
+        # Flag stop terms on the vocab so tokens are rejected via spaCy's
+        # is_stop flag, before any lemma/lowercase strings are built
+        for term in STOP_TERMS:
+            for form in (term, term.capitalize(), term.upper()):
+                self.nlp.vocab[form].is_stop = True
     
-    def extract_terms(self, texts: List[str]) -> Dict[str, int]:
+    def extract_terms(self, texts: Iterable[str]) -> Dict[str, int]:
         """
-        Extract terms from a list of texts.
+        Extract terms from a collection of texts.
         
         Args:
-            texts: List of text strings to process
+            texts: Text strings to process; any iterable (a generator is
+                consumed once, each text cleaned as it's read)
             
         Returns:
             Dictionary of term -> count
         """
         all_terms = Counter()
         
-        for text in texts:
-            terms = self._extract_from_text(text)
-            all_terms.update(terms)
+        # Identical texts (reposts, shared abstracts) are extracted once and
+        # their terms weighted by how often they occur
+        cleaned = Counter(
+            self._clean_text(text)
+            for text in texts
+            if text and isinstance(text, str)
+        )
+        
+        # Stream all texts through spaCy in batches rather than one call each.
+        # Tagging stays in-process: collect extracts while its fetch threads
+        # are still running, and forking spaCy workers from a multi-threaded
+        # process can deadlock
+        docs = self.nlp.pipe(cleaned, batch_size=SPACY_BATCH_SIZE)
+        for (text, repeats), doc in zip(cleaned.items(), docs):
+            terms = self._extract_from_doc(text, doc)
+            if repeats == 1:
+                all_terms.update(terms)
+            else:
+                for term, count in Counter(terms).items():
+                    all_terms[term] += count * repeats
         
         # Filter by minimum frequency
         filtered = {
@@ -55,17 +110,12 @@ class TermExtractor:
         
         return filtered
     
-    def _extract_from_text(self, text: str) -> List[str]:
-        """Extract terms from a single text."""
-        if not text or not isinstance(text, str):
-            return []
-        
-        # Clean text
-        text = self._clean_text(text)
-        
-        # Process with spaCy
-        doc = self.nlp(text)
+    def _extract_from_doc(self, text: str, doc) -> List[str]:
+        """Extract terms from a cleaned text and its spaCy doc.
         
+        Terms are interned: the same few thousand strings recur across
+        every text, so the counters end up sharing one copy of each.
+        """
         terms = []
         
         # Extract single tokens (nouns, proper nouns, adjectives that might be tech terms)
@@ -73,15 +123,7 @@ class TermExtractor:
             if self._is_valid_token(token):
                 term = token.lemma_.lower()
                 if self._is_valid_term(term):
-                    terms.append(term)
-        
-        # Extract noun chunks (multi-word terms like "machine learning")
-        # Re-enable parser temporarily for this
-        doc2 = self.nlp.make_doc(text)
-        for chunk in self.nlp.get_pipe("parser")(doc2).noun_chunks if "parser" in self.nlp.pipe_names else []:
-            chunk_text = chunk.text.lower().strip()
-            if self._is_valid_compound_term(chunk_text):
-                terms.append(chunk_text)
+                    terms.append(sys.intern(term))
         
         # Also extract compound patterns directly
         compound_terms = self._extract_compound_terms(text)
@@ -91,25 +133,23 @@ class TermExtractor:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        # Remove HTML entities
-        text = re.sub(r'&#?x?[0-9a-fA-F]+;?', ' ', text)
-        text = re.sub(r'&\w+;', ' ', text)
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', ' ', text)
-        # Remove URLs
-        text = re.sub(r'https?://\S+', '', text)
-        text = re.sub(r'www\.\S+', '', text)
-        # Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
-        # Remove common URL parts
-        text = re.sub(r'\b(href|nofollow|rel|http|https|www|com|org|net|io)\b', ' ', text)
-        # Remove special characters but keep hyphens in words
-        text = re.sub(r'[^\w\s\-]', ' ', text)
-        # Remove standalone single characters and numbers
-        text = re.sub(r'\b\w\b', ' ', text)
-        # Normalize whitespace
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        # Cap very long texts, preferably at a sentence end (cleaning strips
+        # the punctuation, so this has to happen first)
+        if len(text) > MAX_TEXT_CHARS:
+            cut = text.rfind('. ', 0, MAX_TEXT_CHARS)
+            text = text[:cut + 1] if cut > MAX_TEXT_CHARS // 2 else text[:MAX_TEXT_CHARS]
+        # Remove HTML entities and tags (one pass: none of these can overlap)
+        text = MARKUP_PATTERN.sub(' ', text)
+        # Remove URLs and email addresses (separately and in this order, as
+        # removing one can change what the next matches)
+        text = URL_PATTERN.sub('', text)
+        text = WWW_PATTERN.sub('', text)
+        text = EMAIL_PATTERN.sub('', text)
+        # Remove common URL parts, special characters (keeping hyphens in
+        # words) and standalone single characters and numbers, in one pass
+        text = NOISE_PATTERN.sub(' ', text)
+        # Normalize whitespace (split/join also trims the ends)
+        return ' '.join(text.split())
     
     def _is_valid_token(self, token) -> bool:
         """Check if a spaCy token should be extracted."""
@@ -117,7 +157,7 @@ class TermExtractor:
         if token.is_stop or token.is_punct or token.is_digit:
             return False
         # Only nouns, proper nouns, and some adjectives
-        if token.pos_ not in ("NOUN", "PROPN", "ADJ"):
+        if token.pos not in VALID_POS:
             return False
         return True
     
@@ -129,25 +169,8 @@ class TermExtractor:
         # Not a stop term
         if term in self.stop_terms:
             return False
-        # Not purely numeric
-        if term.isdigit():
-            return False
-        # Has at least some letters
-        if not any(c.isalpha() for c in term):
-            return False
-        return True
-    
-    def _is_valid_compound_term(self, term: str) -> bool:
-        """Check if a compound term is valid."""
-        words = term.split()
-        # Must be 2-4 words
-        if len(words) < 2 or len(words) > 4:
-            return False
-        # Total length check
-        if len(term) < MIN_TERM_LENGTH or len(term) > MAX_TERM_LENGTH:
-            return False
-        # Not all stop words
-        if all(w in self.stop_terms for w in words):
+        # Has at least some letters (this also rules out purely numeric terms)
+        if not LETTER_PATTERN.search(term):
             return False
         return True
     
@@ -156,24 +179,23 @@ class TermExtractor:
         compounds = []
         text_lower = text.lower()
         
-        # Common tech compound patterns
-        patterns = [
-            r'\b(\w+[\-]\w+)\b',  # Hyphenated terms like "open-source"
-            r'\b(\w+\.js|\w+\.py|\w+\.ai)\b',  # Tech frameworks
-            r'\b([A-Z][a-z]+[A-Z]\w+)\b',  # CamelCase terms
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if self._is_valid_term(match.lower()):
-                    compounds.append(match.lower())
+        for pattern in COMPOUND_PATTERNS:
+            for match in pattern.findall(text_lower):
+                if self._is_valid_term(match):
+                    compounds.append(sys.intern(match))
         
         return compounds
 
 
+# Shared extractor for the convenience function, created on first use so
+# the spaCy model is loaded once per process rather than once per call
+_extractor: Optional[TermExtractor] = None
+
+
 # Convenience function
-def extract_terms(texts: List[str]) -> Dict[str, int]:
+def extract_terms(texts: Iterable[str]) -> Dict[str, int]:
     """Extract terms from texts using default extractor."""
-    extractor = TermExtractor()
-    return extractor.extract_terms(texts)
+    global _extractor
+    if _extractor is None:
+        _extractor = TermExtractor()
+    return _extractor.extract_terms(texts)
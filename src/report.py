@@ -1,24 +1,47 @@
 """Generate trending term reports."""
 
 import argparse
-from datetime import date, timedelta
+import io
+from datetime import date
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-import sys
+from typing import Final
 
-# Add parent to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from config import OUTPUT_DIR, ensure_dirs
+from src.database import (
+    get_trending_terms, get_trending_terms_per_source, get_term_history, close_connection,
+)
+from src.analysis.trends import compute_all_emergence_views
 
-from config import OUTPUT_DIR
-from src.database import get_trending_terms, get_term_history
-from src.analysis.trends import get_emerging_terms, get_arxiv_only_terms
+# Static report fragments, built once rather than on every report
+REPORT_TABLE_HEADER = (
+    "| Rank | Term | Count | Sources | First Seen |\n"
+    "|------|------|-------|---------|------------|\n"
+)
+EMERGING_TABLE_HEADER = (
+    "| Term | Score | Count | Sources | New? |\n"
+    "|------|-------|-------|---------|------|\n"
+)
+BREAKDOWN_SOURCES = ("hackernews", "arxiv", "github")
 
+# Console/report icons, spelled as named escapes so the source stays ASCII
+ICON_EMERGING: Final = "\N{ROCKET}"
+ICON_TRENDING: Final = "\N{CHART WITH UPWARDS TREND}"
+ICON_ARXIV: Final = "\N{MICROSCOPE}"
 
-def generate_report(days: int = 7, limit: int = 50, output_file: str = None):
-    """Generate a trending terms report."""
+# New-term marker, indexed by the is_new flag
+NEW_MARKERS: Final = ("", "\N{SPARKLES}")
+
+
+def generate_report(days: int = 7, limit: int = 50, output_file: str = None, report_date: date = None):
+    """Generate a trending terms report (report_date defaults to today)."""
+    if report_date is None:
+        report_date = date.today()
     
     print(f"\n{'='*60}")
     print(f"KEYWORD INTELLIGENCE REPORT")
-    print(f"Period: Last {days} days (as of {date.today()})")
+    print(f"Period: Last {days} days (as of {report_date})")
     print('='*60)
     
     # Get trending terms
@@ -29,125 +52,114 @@ def generate_report(days: int = 7, limit: int = 50, output_file: str = None):
         print("  python -m src.collect")
         return
     
-    # Build report content
-    lines = []
-    lines.append(f"# Keyword Intelligence Report")
-    lines.append(f"**Generated:** {date.today()}")
-    lines.append(f"**Period:** Last {days} days")
-    lines.append(f"")
-    lines.append(f"## Top Trending Terms")
-    lines.append(f"")
-    lines.append(f"| Rank | Term | Count | Sources | First Seen |")
-    lines.append(f"|------|------|-------|---------|------------|")
-    
-    for i, term_data in enumerate(trending, 1):
-        term = term_data["term"]
-        count = term_data["total_count"]
-        sources = term_data["source_count"]
-        first_seen = term_data["first_seen"]
-        source_list = term_data["sources"]
-        
-        lines.append(f"| {i} | **{term}** | {count} | {sources} ({source_list}) | {first_seen} |")
+    # Build report content, written line by line into one buffer
+    report = io.StringIO()
+    report.write(f"# Keyword Intelligence Report\n")
+    report.write(f"**Generated:** {report_date}\n")
+    report.write(f"**Period:** Last {days} days\n")
+    report.write(f"\n")
+    report.write(f"## Top Trending Terms\n")
+    report.write(f"\n")
+    report.write(REPORT_TABLE_HEADER)
+    
+    trending_fields = itemgetter("term", "total_count", "source_count", "first_seen", "sources")
+    for i, (term, count, sources, first_seen, source_list) in enumerate(
+        map(trending_fields, trending), 1
+    ):
+        report.write(f"| {i} | **{term}** | {count} | {sources} ({source_list}) | {first_seen} |\n")
         
         # Print to console too
         print(f"{i:3d}. {term:30s} | count: {count:3d} | sources: {sources} | {source_list}")
     
-    lines.append(f"")
-    lines.append(f"---")
-    lines.append(f"")
-    lines.append(f"## Breakdown by Source")
-    lines.append(f"")
+    report.write(f"\n")
+    report.write(f"---\n")
+    report.write(f"\n")
+    report.write(f"## Breakdown by Source\n")
     
-    # Get source-specific trends
-    for source in ["hackernews", "arxiv", "github"]:
-        source_trending = get_trending_terms(days=days, limit=20, source_name=source)
+    # Get source-specific trends (every source's top terms in one query)
+    trending_by_source = get_trending_terms_per_source(days=days, per_source_limit=10)
+    for source in BREAKDOWN_SOURCES:
+        source_trending = trending_by_source.get(source)
         if source_trending:
-            lines.append(f"### {source.title()}")
-            lines.append(f"")
-            for term_data in source_trending[:10]:
-                lines.append(f"- **{term_data['term']}** ({term_data['total_count']})")
-            lines.append(f"")
+            report.write(f"\n")
+            report.write(f"### {source.title()}\n")
+            report.write(f"\n")
+            for term_data in source_trending:
+                report.write(f"- **{term_data['term']}** ({term_data['total_count']})\n")
     
     # Write to file
     if output_file is None:
-        output_file = OUTPUT_DIR / f"report_{date.today()}.md"
+        output_file = OUTPUT_DIR / f"report_{report_date}.md"
     else:
         output_file = Path(output_file)
     
-    report_content = "\n".join(lines)
-    output_file.write_text(report_content)
+    ensure_dirs()
+    output_file.write_text(report.getvalue(), encoding="utf-8")
     
     print(f"\n{'='*60}")
     print(f"Report saved to: {output_file}")
     print('='*60)
 
 
-def generate_emerging_report(days: int = 7, limit: int = 30):
+def generate_emerging_report(days: int = 7, limit: int = 30, report_date: date = None):
     """Generate a report focused on EMERGING terms, not just popular ones."""
+    if report_date is None:
+        report_date = date.today()
     
     print(f"\n{'='*60}")
-    print(f"🚀 EMERGING TERMS REPORT")
-    print(f"Period: Last {days} days (as of {date.today()})")
+    print(f"{ICON_EMERGING} EMERGING TERMS REPORT")
+    print(f"Period: Last {days} days (as of {report_date})")
     print(f"Focus: New & growing terms, not already-mainstream")
     print('='*60)
     
-    # Get emerging terms
-    emerging = get_emerging_terms(days=days, limit=limit)
+    # Get emerging terms and arXiv-only terms (earliest signals), which
+    # share one aggregate query
+    emerging, arxiv_only = compute_all_emergence_views(
+        days=days, limit_emerging=limit, limit_arxiv=15
+    )
     
     if not emerging:
         print("\nNo emerging terms found. Need more data - run collection for a few days.")
         return
     
-    print(f"\n📈 TOP EMERGING TERMS (by emergence score)")
+    print(f"\n{ICON_TRENDING} TOP EMERGING TERMS (by emergence score)")
     print(f"{'Term':<30} {'Score':>6} {'Count':>6} {'Sources':>8} {'New?':>5}")
     print("-" * 60)
     
-    for term_data in emerging[:20]:
-        term = term_data["term"]
-        score = term_data["emergence_score"]
-        count = term_data["total_count"]
-        sources = term_data["source_count"]
-        is_new = "✨" if term_data["is_new"] else ""
-        
-        print(f"{term:<30} {score:>6} {count:>6} {sources:>8} {is_new:>5}")
-    
-    # Get arXiv-only terms (earliest signals)
-    arxiv_only = get_arxiv_only_terms(days=days, limit=15)
+    emerging_fields = itemgetter("term", "emergence_score", "total_count", "source_count", "is_new")
+    for term, score, count, sources, is_new in map(emerging_fields, islice(emerging, 20)):
+        print(f"{term:<30} {score:>6} {count:>6} {sources:>8} {NEW_MARKERS[is_new]:>5}")
     
     if arxiv_only:
-        print(f"\n🔬 ARXIV-ONLY TERMS (academic signals not yet in HN/GitHub)")
+        print(f"\n{ICON_ARXIV} ARXIV-ONLY TERMS (academic signals not yet in HN/GitHub)")
         print(f"{'Term':<30} {'Count':>6}")
         print("-" * 40)
         
-        for term_data in arxiv_only[:10]:
+        for term_data in islice(arxiv_only, 10):
             print(f"{term_data['term']:<30} {term_data['count']:>6}")
     
     # Save report
-    output_file = OUTPUT_DIR / f"emerging_{date.today()}.md"
+    output_file = OUTPUT_DIR / f"emerging_{report_date}.md"
     
-    lines = [
-        f"# Emerging Terms Report - {date.today()}",
-        f"",
-        f"## Top Emerging Terms",
-        f"",
-        f"| Term | Score | Count | Sources | New? |",
-        f"|------|-------|-------|---------|------|",
-    ]
+    report = io.StringIO()
+    report.write(f"# Emerging Terms Report - {report_date}\n")
+    report.write(f"\n")
+    report.write(f"## Top Emerging Terms\n")
+    report.write(f"\n")
+    report.write(EMERGING_TABLE_HEADER)
     
-    for term_data in emerging[:20]:
-        new_marker = "✨" if term_data["is_new"] else ""
-        lines.append(f"| {term_data['term']} | {term_data['emergence_score']} | {term_data['total_count']} | {term_data['source_count']} | {new_marker} |")
+    for term, score, count, sources, is_new in map(emerging_fields, islice(emerging, 20)):
+        report.write(f"| {term} | {score} | {count} | {sources} | {NEW_MARKERS[is_new]} |\n")
     
     if arxiv_only:
-        lines.extend([
-            f"",
-            f"## arXiv-Only Terms (Earliest Signals)",
-            f"",
-        ])
-        for term_data in arxiv_only[:10]:
-            lines.append(f"- **{term_data['term']}** ({term_data['count']})")
-    
-    output_file.write_text("\n".join(lines))
+        report.write(f"\n")
+        report.write(f"## arXiv-Only Terms (Earliest Signals)\n")
+        report.write(f"\n")
+        for term_data in islice(arxiv_only, 10):
+            report.write(f"- **{term_data['term']}** ({term_data['count']})\n")
+    
+    ensure_dirs()
+    output_file.write_text(report.getvalue(), encoding="utf-8")
     print(f"\nReport saved to: {output_file}")
 
 
@@ -202,12 +214,19 @@ def main():
     )
     args = parser.parse_args()
     
+    # One date for the whole run (headers, filenames)
+    report_date = date.today()
+    
     if args.term:
         show_term_detail(args.term, days=args.days)
     elif args.emerging:
-        generate_emerging_report(days=args.days, limit=args.limit)
+        generate_emerging_report(days=args.days, limit=args.limit, report_date=report_date)
     else:
-        generate_report(days=args.days, limit=args.limit, output_file=args.output)
+        generate_report(
+            days=args.days, limit=args.limit, output_file=args.output, report_date=report_date
+        )
+    
+    close_connection()
 
 
 if __name__ == "__main__":